@@ -1,9 +1,12 @@
+import asyncio
 import json
 import re
+from functools import cached_property
 
 from src.config import Settings
 from src.github_client import GitHubClient
 from src.llm_client import LLMClient
+from src.review_cache import ReviewCache, review_key
 
 
 SYSTEM_PROMPT = """You are an expert code reviewer. Your task is to review pull request changes and verify they correctly implement the requirements from the linked issue.
@@ -42,21 +45,76 @@ Be constructive and specific in your feedback. If there are no issues, approve t
 class ReviewerAgent:
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.github = GitHubClient(settings)
-        self.llm = LLMClient(settings)
-
-    def run(self, pr_number: int) -> dict:
-        pr = self.github.get_pull_request(pr_number)
-
-        issue_number = self._extract_issue_number(pr.body or "")
-        issue_content = ""
-        if issue_number:
-            issue = self.github.get_issue(issue_number)
-            issue_content = f"Issue #{issue_number}: {issue.title}\n\n{issue.body or ''}"
-
-        diff = self.github.get_pr_diff(pr_number)
-        check_runs = self.github.get_check_runs(pr_number)
-
+        self.review_cache = ReviewCache(settings.cache_dir)
+
+    @cached_property
+    def llm(self) -> LLMClient:
+        return LLMClient(self.settings)
+
+    async def run(self, pr_number: int) -> dict:
+        async with GitHubClient(self.settings) as github:
+            pr = await github.get_pull_request(pr_number)
+
+            issue_number = self._extract_issue_number(pr["body"] or "")
+
+            async def fetch_issue_content() -> str:
+                if not issue_number:
+                    return ""
+                issue = await github.get_issue(issue_number)
+                return self._format_issue(issue_number, issue["title"], issue["body"])
+
+            issue_content, builder, check_runs = await asyncio.gather(
+                fetch_issue_content(),
+                github.build_pr_diff(
+                    pr_number,
+                    max_chars=self.settings.diff_max_chars,
+                    exclude_globs=self.settings.diff_exclude_patterns(),
+                    max_file_chars=self.settings.diff_max_file_chars,
+                    complete=self.settings.review_cache,
+                ),
+                github.get_check_runs(pr_number, head_sha=pr["head"]["sha"]),
+            )
+            diff = builder.render(pr["changed_files"])
+
+            key = review_key(
+                self.settings.openai_model, builder.digests, issue_content, check_runs
+            )
+            cached = await self._load_cached_review(pr_number, key)
+            if cached is not None:
+                await github.add_pr_comment(pr_number, self._format_unchanged_note(cached))
+                return self._review_result(cached, cached=True)
+
+            user_prompt = self._build_prompt(pr["title"], issue_content, diff, check_runs)
+            response = await self.llm.chat(SYSTEM_PROMPT, user_prompt)
+            review = self._parse_response(response)
+
+            if not review:
+                return {"success": False, "error": "Failed to parse review"}
+
+            await github.add_pr_comment(pr_number, self._format_review(review))
+            await self._save_cached_review(pr_number, key, review)
+
+        return self._review_result(review)
+
+    async def _load_cached_review(self, pr_number: int, key: str) -> dict | None:
+        if not self.settings.review_cache:
+            return None
+        return await asyncio.to_thread(
+            self.review_cache.load, self.settings.target_repo, pr_number, key
+        )
+
+    async def _save_cached_review(self, pr_number: int, key: str, review: dict) -> None:
+        if self.settings.review_cache:
+            await asyncio.to_thread(
+                self.review_cache.save, self.settings.target_repo, pr_number, key, review
+            )
+
+    def _format_issue(self, issue_number: int, title: str, body: str | None) -> str:
+        return f"Issue #{issue_number}: {title}\n\n{body or ''}"
+
+    def _build_prompt(
+        self, pr_title: str, issue_content: str, diff: str, check_runs: list[dict]
+    ) -> str:
         ci_status = "No CI checks found"
         if check_runs:
             ci_parts = []
@@ -65,32 +123,26 @@ class ReviewerAgent:
                 ci_parts.append(f"- {run['name']}: {status}")
             ci_status = "\n".join(ci_parts)
 
-        user_prompt = f"""Pull Request: {pr.title}
+        return f"""Pull Request: {pr_title}
 
 Original Issue Requirements:
 {issue_content if issue_content else "No linked issue found"}
 
 Code Changes (Diff):
-{diff[:15000]}
+{diff}
 
 CI/CD Status:
 {ci_status}
 
 Please review the changes and provide your assessment."""
 
-        response = self.llm.chat(SYSTEM_PROMPT, user_prompt)
-        review = self._parse_response(response)
-
-        if not review:
-            return {"success": False, "error": "Failed to parse review"}
-
-        self._post_review(pr_number, review)
-
+    def _review_result(self, review: dict, cached: bool = False) -> dict:
         return {
             "success": True,
             "approved": review.get("approved", False),
             "summary": review.get("summary", ""),
             "issues_count": len(review.get("issues", [])),
+            "cached": cached,
         }
 
     def _extract_issue_number(self, body: str) -> int | None:
@@ -116,7 +168,7 @@ Please review the changes and provide your assessment."""
             pass
         return {}
 
-    def _post_review(self, pr_number: int, review: dict) -> None:
+    def _format_review(self, review: dict) -> str:
         summary = review.get("summary", "Review completed")
         issues = review.get("issues", [])
         approved = review.get("approved", False)
@@ -143,6 +195,12 @@ Please review the changes and provide your assessment."""
                     file_info += "`)"
                 body_parts.append(f"- **[{severity}]** {desc}{file_info}\n")
 
-        body = "".join(body_parts)
+        return "".join(body_parts)
 
-        self.github.add_pr_comment(pr_number, body)
+    def _format_unchanged_note(self, review: dict) -> str:
+        approved = review.get("approved", False)
+        return (
+            "## AI Code Review\n"
+            "Unchanged since last review: the diff, linked issue and CI results are the same.\n"
+            f"**Previous status:** {'✅ Approved' if approved else '❌ Changes Requested'}\n"
+        )
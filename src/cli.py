@@ -1,10 +1,10 @@
+import asyncio
 import sys
 
 import click
 
-from src.agents.code_agent import CodeAgent
-from src.agents.reviewer_agent import ReviewerAgent
-from src.config import get_settings
+from src.config import Settings, get_settings
+from src.worker import job_timeout, submit
 
 
 @click.group()
@@ -12,14 +12,7 @@ def cli():
     pass
 
 
-@cli.command()
-@click.argument("issue_number", type=int)
-@click.option("--repo", envvar="TARGET_REPO", help="Target repository (owner/repo)")
-def solve(issue_number: int, repo: str | None):
-    settings = get_settings()
-    if repo:
-        settings.target_repo = repo
-
+def validate_settings(settings: Settings) -> None:
     if not settings.github_token:
         click.echo("Error: GITHUB_TOKEN is required", err=True)
         sys.exit(1)
@@ -30,10 +23,37 @@ def solve(issue_number: int, repo: str | None):
         click.echo("Error: TARGET_REPO is required", err=True)
         sys.exit(1)
 
-    click.echo(f"Processing issue #{issue_number} in {settings.target_repo}...")
 
-    agent = CodeAgent(settings)
-    result = agent.run(issue_number)
+@cli.command()
+@click.argument("issue_number", type=int)
+@click.option("--repo", envvar="TARGET_REPO", help="Target repository (owner/repo)")
+@click.option("--candidates", type=int, help="Number of candidate change sets to generate")
+def solve(issue_number: int, repo: str | None, candidates: int | None):
+    settings = get_settings()
+    if repo:
+        settings.target_repo = repo
+    if candidates:
+        settings.candidate_count = candidates
+
+    result = None
+    if settings.worker_socket:
+        result = submit(
+            settings.worker_socket,
+            "solve",
+            issue_number,
+            settings.target_repo,
+            candidates,
+            job_timeout(settings, candidates),
+        )
+
+    if result is None:
+        validate_settings(settings)
+        click.echo(f"Processing issue #{issue_number} in {settings.target_repo}...")
+
+        from src.agents.code_agent import CodeAgent
+
+        agent = CodeAgent(settings)
+        result = asyncio.run(agent.run(issue_number))
 
     if result.get("success"):
         click.echo(f"Success! PR {result['action']}: {result['pr_url']}")
@@ -50,23 +70,29 @@ def review(pr_number: int, repo: str | None):
     if repo:
         settings.target_repo = repo
 
-    if not settings.github_token:
-        click.echo("Error: GITHUB_TOKEN is required", err=True)
-        sys.exit(1)
-    if not settings.openai_api_key:
-        click.echo("Error: OPENAI_API_KEY is required", err=True)
-        sys.exit(1)
-    if not settings.target_repo:
-        click.echo("Error: TARGET_REPO is required", err=True)
-        sys.exit(1)
+    result = None
+    if settings.worker_socket:
+        result = submit(
+            settings.worker_socket,
+            "review",
+            pr_number,
+            settings.target_repo,
+            timeout=job_timeout(settings),
+        )
+
+    if result is None:
+        validate_settings(settings)
+        click.echo(f"Reviewing PR #{pr_number} in {settings.target_repo}...")
 
-    click.echo(f"Reviewing PR #{pr_number} in {settings.target_repo}...")
+        from src.agents.reviewer_agent import ReviewerAgent
 
-    agent = ReviewerAgent(settings)
-    result = agent.run(pr_number)
+        agent = ReviewerAgent(settings)
+        result = asyncio.run(agent.run(pr_number))
 
     if result.get("success"):
         status = "approved" if result.get("approved") else "changes requested"
+        if result.get("cached"):
+            status += " (unchanged since last review)"
         click.echo(f"Review complete: {status}")
         click.echo(f"Summary: {result.get('summary', 'N/A')}")
         if result.get("issues_count", 0) > 0:
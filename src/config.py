@@ -1,6 +1,24 @@
 import os
 from pydantic_settings import BaseSettings
 
+DEFAULT_DIFF_EXCLUDE_GLOBS = ",".join([
+    "*.lock",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+    "go.sum",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*.pb.go",
+    "*_pb2.py",
+    "*.generated.*",
+    "vendor/*",
+    "*/vendor/*",
+    "node_modules/*",
+    "*/node_modules/*",
+    "dist/*",
+])
+
 
 class Settings(BaseSettings):
     github_token: str = ""
@@ -13,6 +31,16 @@ class Settings(BaseSettings):
     openai_base_url: str | None = None
     max_iterations: int = 5
     target_repo: str = ""
+    candidate_count: int = 1
+    candidate_test_command: str = ""
+    candidate_test_timeout: int = 300
+    cache_dir: str = ".sdlc-cache"
+    outline_full_files: int = 3
+    diff_exclude_globs: str = DEFAULT_DIFF_EXCLUDE_GLOBS
+    diff_max_chars: int = 15000
+    diff_max_file_chars: int = 8000
+    worker_socket: str = ""
+    review_cache: bool = True
 
     class Config:
         env_file = ".env"
@@ -21,6 +49,9 @@ class Settings(BaseSettings):
     def use_github_app(self) -> bool:
         return bool(self.github_app_id and self.github_app_private_key)
 
+    def diff_exclude_patterns(self) -> list[str]:
+        return [glob.strip() for glob in self.diff_exclude_globs.split(",") if glob.strip()]
+
 
 def get_settings() -> Settings:
     private_key = os.getenv("GITHUB_APP_PRIVATE_KEY", "")
@@ -40,4 +71,14 @@ def get_settings() -> Settings:
         openai_base_url=os.getenv("OPENAI_BASE_URL"),
         max_iterations=int(os.getenv("MAX_ITERATIONS", "5")),
         target_repo=os.getenv("TARGET_REPO", ""),
+        candidate_count=int(os.getenv("CANDIDATE_COUNT", "1")),
+        candidate_test_command=os.getenv("CANDIDATE_TEST_COMMAND", ""),
+        candidate_test_timeout=int(os.getenv("CANDIDATE_TEST_TIMEOUT", "300")),
+        cache_dir=os.getenv("CACHE_DIR", ".sdlc-cache"),
+        outline_full_files=int(os.getenv("OUTLINE_FULL_FILES", "3")),
+        diff_exclude_globs=os.getenv("DIFF_EXCLUDE_GLOBS", DEFAULT_DIFF_EXCLUDE_GLOBS),
+        diff_max_chars=int(os.getenv("DIFF_MAX_CHARS", "15000")),
+        diff_max_file_chars=int(os.getenv("DIFF_MAX_FILE_CHARS", "8000")),
+        worker_socket=os.getenv("WORKER_SOCKET", ""),
+        review_cache=os.getenv("REVIEW_CACHE", "true").lower() not in ("0", "false", "no"),
     )
@@ -1,150 +1,327 @@
-from github import Auth, Github, GithubException, GithubIntegration
-from github.Issue import Issue
-from github.PullRequest import PullRequest
-from github.Repository import Repository
+import asyncio
+import base64
+import io
+import tarfile
+from collections.abc import AsyncIterator
+from fnmatch import fnmatch
+from urllib.parse import quote
+
+import httpx
+from github import Auth, GithubIntegration
 
 from src.config import Settings
+from src.review_cache import file_digest
 
 
-class GitHubClient:
-    def __init__(self, settings: Settings):
-        self.settings = settings
-        self.gh = self._create_github_client()
-        self.repo: Repository = self.gh.get_repo(settings.target_repo)
-
-    def _create_github_client(self) -> Github:
-        if self.settings.use_github_app():
-            auth = Auth.AppAuth(
-                int(self.settings.github_app_id),
-                self.settings.github_app_private_key,
-            )
-            gi = GithubIntegration(auth=auth)
+def get_installation_token(settings: Settings) -> str | None:
+    if not settings.use_github_app():
+        return settings.github_token
 
-            if self.settings.github_app_installation_id:
-                installation_id = int(self.settings.github_app_installation_id)
-            else:
-                owner = self.settings.target_repo.split("/")[0]
-                installation = gi.get_installations()[0]
-                installation_id = installation.id
+    auth = Auth.AppAuth(
+        int(settings.github_app_id),
+        settings.github_app_private_key,
+    )
+    gi = GithubIntegration(auth=auth)
 
-            return gi.get_github_for_installation(installation_id)
+    if settings.github_app_installation_id:
+        installation_id = int(settings.github_app_installation_id)
+    else:
+        installation = gi.get_installations()[0]
+        installation_id = installation.id
 
-        return Github(self.settings.github_token)
+    token = gi.get_access_token(installation_id)
+    return token.token
 
-    def get_installation_token(self) -> str | None:
-        if not self.settings.use_github_app():
-            return self.settings.github_token
 
-        auth = Auth.AppAuth(
-            int(self.settings.github_app_id),
-            self.settings.github_app_private_key,
+def make_file_record(
+    filename: str,
+    status: str,
+    additions: int,
+    deletions: int,
+    patch: str | None,
+    exclude_globs: list[str] | None = None,
+    max_file_chars: int | None = None,
+    sha: str | None = None,
+) -> dict:
+    record = {
+        "filename": filename,
+        "status": status,
+        "additions": additions,
+        "deletions": deletions,
+        "patch": patch,
+        "skipped": None,
+        "digest": file_digest(filename, status, patch, sha),
+    }
+    basename = filename.rsplit("/", 1)[-1]
+    if any(fnmatch(filename, g) or fnmatch(basename, g) for g in exclude_globs or []):
+        record["patch"] = None
+        record["skipped"] = "excluded"
+    elif not patch:
+        record["skipped"] = "binary or no textual diff"
+    elif max_file_chars is not None and len(patch) > max_file_chars:
+        record["patch"] = (
+            patch[:max_file_chars] + f"\n[truncated {len(patch) - max_file_chars} chars]"
         )
-        gi = GithubIntegration(auth=auth)
+    return record
+
+
+def read_tarball(data: bytes, max_file_size: int) -> dict[str, str | None]:
+    files: dict[str, str | None] = {}
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            path = member.name.split("/", 1)[-1]
+            content = None
+            extracted = archive.extractfile(member) if member.size <= max_file_size else None
+            if extracted is not None:
+                raw = extracted.read()
+                try:
+                    content = raw.decode("utf-8")
+                except UnicodeDecodeError:
+                    content = None
+            files[path] = content
+    return files
+
+
+class DiffBuilder:
+    def __init__(self, max_chars: int | None = None):
+        self.max_chars = max_chars
+        self.parts: list[str] = []
+        self.skipped: list[str] = []
+        self.digests: list[str] = []
+        self.size = 0
+        self.seen = 0
+        self.omitted = 0
+        self.exhausted = False
+
+    def add(self, record: dict) -> bool:
+        self.seen += 1
+        self.digests.append(record["digest"])
+        if self.exhausted:
+            self.omitted += 1
+            return False
+        if record["skipped"]:
+            self.skipped.append(f"- {record['filename']}: {record['skipped']}")
+            return True
+        part = f"File: {record['filename']}\nStatus: {record['status']}\n{record['patch']}\n\n"
+        if self.max_chars is not None and self.size + len(part) > self.max_chars:
+            kept = part[: self.max_chars - self.size]
+            self.parts.append(f"{kept}\n[truncated {len(part) - len(kept)} chars]\n\n")
+            self.skipped.append(f"- {record['filename']}: truncated by diff budget")
+            self.size = self.max_chars
+            self.exhausted = True
+            return False
+        self.parts.append(part)
+        self.size += len(part)
+        return True
+
+    def render(self, total_files: int | None = None) -> str:
+        skipped = list(self.skipped)
+        remaining = self.omitted
+        if total_files is not None:
+            remaining += max(total_files - self.seen, 0)
+        if remaining:
+            skipped.append(f"- diff budget exhausted; {remaining} more file(s) not included")
+        elif total_files is None and self.exhausted:
+            skipped.append("- diff budget exhausted; remaining files were not fetched")
+        if not skipped:
+            return "".join(self.parts)
+        return "".join(self.parts) + "Skipped files:\n" + "\n".join(skipped) + "\n"
+
+
+class GitHubClient:
+    def __init__(self, settings: Settings, transport: httpx.AsyncBaseTransport | None = None):
+        self.settings = settings
+        self.repo_name = settings.target_repo
+        self.token: str | None = None
+        self.client = httpx.AsyncClient(
+            base_url="https://api.github.com",
+            headers={
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            timeout=60,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "GitHubClient":
+        self.token = await asyncio.to_thread(get_installation_token, self.settings)
+        self.client.headers["Authorization"] = f"Bearer {self.token}"
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.client.aclose()
 
-        if self.settings.github_app_installation_id:
-            installation_id = int(self.settings.github_app_installation_id)
-        else:
-            installation = gi.get_installations()[0]
-            installation_id = installation.id
+    async def _get(self, path: str, **params: str | int) -> dict:
+        response = await self.client.get(path, params=params or None)
+        response.raise_for_status()
+        data: dict = response.json()
+        return data
 
-        token = gi.get_access_token(installation_id)
-        return token.token
+    async def _post(self, path: str, payload: dict) -> dict:
+        response = await self.client.post(path, json=payload)
+        response.raise_for_status()
+        data: dict = response.json()
+        return data
 
-    def get_issue(self, issue_number: int) -> Issue:
-        return self.repo.get_issue(issue_number)
+    async def _paginate(self, path: str, **params: str | int) -> AsyncIterator[dict]:
+        url: str | None = path
+        query: dict | None = {"per_page": 100, **params}
+        while url:
+            response = await self.client.get(url, params=query)
+            response.raise_for_status()
+            for item in response.json():
+                yield item
+            url = response.links.get("next", {}).get("url")
+            query = None
 
-    def get_pull_request(self, pr_number: int) -> PullRequest:
-        return self.repo.get_pull(pr_number)
+    async def get_issue(self, issue_number: int) -> dict:
+        return await self._get(f"/repos/{self.repo_name}/issues/{issue_number}")
 
-    def create_pull_request(
+    async def get_pull_request(self, pr_number: int) -> dict:
+        return await self._get(f"/repos/{self.repo_name}/pulls/{pr_number}")
+
+    async def create_pull_request(
         self, title: str, body: str, head: str, base: str = "main"
-    ) -> PullRequest:
-        return self.repo.create_pull(title=title, body=body, head=head, base=base)
-
-    def get_pr_diff(self, pr_number: int) -> str:
-        pr = self.get_pull_request(pr_number)
-        files = pr.get_files()
-        diff_parts = []
-        for file in files:
-            diff_parts.append(f"File: {file.filename}")
-            diff_parts.append(f"Status: {file.status}")
-            if file.patch:
-                diff_parts.append(file.patch)
-            diff_parts.append("")
-        return "\n".join(diff_parts)
-
-    def get_pr_comments(self, pr_number: int) -> list[dict]:
-        pr = self.get_pull_request(pr_number)
+    ) -> dict:
+        return await self._post(
+            f"/repos/{self.repo_name}/pulls",
+            {"title": title, "body": body, "head": head, "base": base},
+        )
+
+    async def iter_pr_files(
+        self,
+        pr_number: int,
+        exclude_globs: list[str] | None = None,
+        max_file_chars: int | None = None,
+    ) -> AsyncIterator[dict]:
+        async for file in self._paginate(f"/repos/{self.repo_name}/pulls/{pr_number}/files"):
+            yield make_file_record(
+                file["filename"],
+                file["status"],
+                file["additions"],
+                file["deletions"],
+                file.get("patch"),
+                exclude_globs,
+                max_file_chars,
+                file.get("sha"),
+            )
+
+    async def build_pr_diff(
+        self,
+        pr_number: int,
+        max_chars: int | None = None,
+        exclude_globs: list[str] | None = None,
+        max_file_chars: int | None = None,
+        complete: bool = False,
+    ) -> DiffBuilder:
+        builder = DiffBuilder(max_chars)
+        async for record in self.iter_pr_files(pr_number, exclude_globs, max_file_chars):
+            if not builder.add(record) and not complete:
+                break
+        return builder
+
+    async def get_pr_diff(
+        self,
+        pr_number: int,
+        max_chars: int | None = None,
+        exclude_globs: list[str] | None = None,
+        max_file_chars: int | None = None,
+        total_files: int | None = None,
+    ) -> str:
+        builder = await self.build_pr_diff(pr_number, max_chars, exclude_globs, max_file_chars)
+        return builder.render(total_files)
+
+    async def get_pr_comments(self, pr_number: int) -> list[dict]:
         comments = []
-        for comment in pr.get_issue_comments():
-            comments.append({"user": comment.user.login, "body": comment.body})
-        for comment in pr.get_review_comments():
+        async for comment in self._paginate(f"/repos/{self.repo_name}/issues/{pr_number}/comments"):
+            comments.append({"user": comment["user"]["login"], "body": comment["body"]})
+        async for comment in self._paginate(f"/repos/{self.repo_name}/pulls/{pr_number}/comments"):
             comments.append({
-                "user": comment.user.login,
-                "body": comment.body,
-                "path": comment.path,
-                "line": comment.line,
+                "user": comment["user"]["login"],
+                "body": comment["body"],
+                "path": comment["path"],
+                "line": comment.get("line"),
             })
         return comments
 
-    def add_pr_comment(self, pr_number: int, body: str) -> None:
-        pr = self.get_pull_request(pr_number)
-        pr.create_issue_comment(body)
+    async def add_pr_comment(self, pr_number: int, body: str) -> None:
+        await self._post(f"/repos/{self.repo_name}/issues/{pr_number}/comments", {"body": body})
 
-    def create_pr_review(
+    async def create_pr_review(
         self, pr_number: int, body: str, event: str = "COMMENT"
     ) -> None:
-        pr = self.get_pull_request(pr_number)
-        pr.create_review(body=body, event=event)
+        await self._post(
+            f"/repos/{self.repo_name}/pulls/{pr_number}/reviews", {"body": body, "event": event}
+        )
 
-    def get_check_runs(self, pr_number: int) -> list[dict]:
-        pr = self.get_pull_request(pr_number)
-        commits = list(pr.get_commits())
-        if not commits:
-            return []
-        last_commit = commits[-1]
-        check_runs = last_commit.get_check_runs()
-        results = []
-        for run in check_runs:
-            results.append({
-                "name": run.name,
-                "status": run.status,
-                "conclusion": run.conclusion,
-                "output": run.output,
-            })
-        return results
+    async def get_check_runs(self, pr_number: int, head_sha: str | None = None) -> list[dict]:
+        if head_sha is None:
+            pr = await self.get_pull_request(pr_number)
+            head_sha = pr["head"]["sha"]
+        runs: list[dict] = []
+        page = 1
+        while True:
+            data = await self._get(
+                f"/repos/{self.repo_name}/commits/{head_sha}/check-runs", per_page=100, page=page
+            )
+            batch = data.get("check_runs", [])
+            runs.extend(batch)
+            if not batch or len(runs) >= data.get("total_count", 0):
+                break
+            page += 1
+        return [
+            {
+                "name": run["name"],
+                "status": run["status"],
+                "conclusion": run["conclusion"],
+                "output": run["output"],
+            }
+            for run in runs
+        ]
 
-    def get_open_prs_for_issue(self, issue_number: int) -> list[PullRequest]:
+    async def get_open_prs_for_issue(self, issue_number: int) -> list[dict]:
         prs = []
-        for pr in self.repo.get_pulls(state="open"):
-            if f"#{issue_number}" in (pr.body or ""):
+        async for pr in self._paginate(f"/repos/{self.repo_name}/pulls", state="open"):
+            if f"#{issue_number}" in (pr["body"] or ""):
                 prs.append(pr)
         return prs
 
-    def get_repo_files(self, path: str = "", ref: str = "main") -> list[str]:
+    async def get_repo_files(self, ref: str = "main") -> list[str]:
         try:
-            contents = self.repo.get_contents(path, ref=ref)
-            files = []
-            if isinstance(contents, list):
-                for content in contents:
-                    if content.type == "dir":
-                        files.extend(self.get_repo_files(content.path, ref))
-                    else:
-                        files.append(content.path)
-            else:
-                files.append(contents.path)
-            return files
-        except GithubException:
+            tree = await self._get(f"/repos/{self.repo_name}/git/trees/{ref}", recursive=1)
+        except httpx.HTTPError:
             return []
+        return [item["path"] for item in tree.get("tree", []) if item["type"] == "blob"]
 
-    def get_file_content(self, path: str, ref: str = "main") -> str | None:
+    async def get_file_content(self, path: str, ref: str = "main") -> str | None:
+        response = await self.client.get(
+            f"/repos/{self.repo_name}/contents/{quote(path)}", params={"ref": ref}
+        )
+        if response.status_code != 200:
+            return None
+        content = response.json()
+        if isinstance(content, list) or "content" not in content:
+            return None
         try:
-            content = self.repo.get_contents(path, ref=ref)
-            if isinstance(content, list):
-                return None
-            return content.decoded_content.decode("utf-8")
-        except GithubException:
+            return base64.b64decode(content["content"]).decode("utf-8")
+        except ValueError:
             return None
 
-    def get_default_branch(self) -> str:
-        return self.repo.default_branch
+    async def get_default_branch(self) -> str:
+        repo = await self._get(f"/repos/{self.repo_name}")
+        return repo["default_branch"]
+
+    async def get_commit_sha(self, ref: str) -> str:
+        branch = await self._get(f"/repos/{self.repo_name}/branches/{ref}")
+        return branch["commit"]["sha"]
+
+    async def get_source_files(
+        self, ref: str, max_file_size: int = 200_000
+    ) -> dict[str, str | None]:
+        response = await self.client.get(
+            f"/repos/{self.repo_name}/tarball/{ref}", follow_redirects=True, timeout=120
+        )
+        response.raise_for_status()
+        return await asyncio.to_thread(read_tarball, response.content, max_file_size)
@@ -1,23 +1,23 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from src.config import Settings
 
 
 class LLMClient:
     def __init__(self, settings: Settings):
-        kwargs = {"api_key": settings.openai_api_key}
-        if settings.openai_base_url:
-            kwargs["base_url"] = settings.openai_base_url
-        self.client = OpenAI(**kwargs)
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url or None,
+        )
         self.model = settings.openai_model
 
-    def chat(self, system_prompt: str, user_prompt: str) -> str:
-        response = self.client.chat.completions.create(
+    async def chat(self, system_prompt: str, user_prompt: str, temperature: float = 0.3) -> str:
+        response = await self.client.chat.completions.create(
             model=self.model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
-            temperature=0.3,
+            temperature=temperature,
         )
         return response.choices[0].message.content or ""
@@ -0,0 +1,172 @@
+import ast
+import json
+import re
+from pathlib import Path
+
+MAX_SIGNATURE_LENGTH = 160
+MAX_OUTLINE_CHARS = 30000
+MAX_LISTED_FILES = 8
+
+TAG_PATTERNS = {
+    (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"): [
+        r"^\s*(export\s+)?(default\s+)?(abstract\s+)?(class|interface|enum)\s+\w+",
+        r"^\s*(export\s+)?type\s+\w+\s*=",
+        r"^\s*(export\s+)?(default\s+)?(async\s+)?function\s*\*?\s*\w+\s*\(",
+        r"^\s*(export\s+)?(const|let|var)\s+\w+\s*=\s*(async\s+)?(\([^)]*\)|\w+)\s*=>",
+        r"^\s+(static\s+)?(async\s+)?"
+        r"(?!if\b|for\b|while\b|switch\b|catch\b|return\b)"
+        r"\w+\s*\([^)]*\)\s*(:\s*[\w<>\[\], |]+)?\s*\{",
+    ],
+    (".go",): [
+        r"^func\s+(\([^)]*\)\s*)?\w+\s*\(",
+        r"^type\s+\w+\s+(struct|interface)\b",
+    ],
+    (".rs",): [
+        r"^\s*(pub(\([^)]*\))?\s+)?(async\s+)?fn\s+\w+",
+        r"^\s*(pub(\([^)]*\))?\s+)?(struct|enum|trait|mod)\s+\w+",
+        r"^\s*impl\b",
+    ],
+    (".java", ".kt", ".cs", ".scala"): [
+        r"^\s*((public|private|protected|internal|static|final|abstract|sealed|data|open)\s+)*"
+        r"(class|interface|enum|record|object)\s+\w+",
+        r"^\s*((public|private|protected|internal|static|final|abstract|override|suspend|async)\s+)+"
+        r"[\w<>\[\], ?]+\s+\w+\s*\(",
+        r"^\s*((private|protected|internal|override|suspend)\s+)*fun\s+\w+",
+    ],
+    (".rb",): [
+        r"^\s*(class|module)\s+\w+",
+        r"^\s*def\s+[\w.?!=]+",
+    ],
+    (".php",): [
+        r"^\s*((abstract|final)\s+)?(class|interface|trait)\s+\w+",
+        r"^\s*((public|private|protected|static)\s+)*function\s+\w+",
+    ],
+}
+
+COMPILED_PATTERNS = {
+    extensions: [re.compile(pattern) for pattern in patterns]
+    for extensions, patterns in TAG_PATTERNS.items()
+}
+
+
+def outline_python(source: str) -> list[str]:
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    return _outline_python_body(tree.body, "")
+
+
+def _outline_python_body(body: list[ast.stmt], indent: str) -> list[str]:
+    symbols = []
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            bases = ", ".join(ast.unparse(base) for base in node.bases)
+            symbols.append(f"{indent}class {node.name}" + (f"({bases})" if bases else ""))
+            symbols.extend(_outline_python_body(node.body, indent + "  "))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+            signature = f"{indent}{prefix} {node.name}({ast.unparse(node.args)})"
+            if node.returns:
+                signature += f" -> {ast.unparse(node.returns)}"
+            symbols.append(signature[:MAX_SIGNATURE_LENGTH])
+    return symbols
+
+
+def outline_tagged(path: str, source: str) -> list[str]:
+    patterns = next(
+        (
+            compiled
+            for extensions, compiled in COMPILED_PATTERNS.items()
+            if path.endswith(extensions)
+        ),
+        None,
+    )
+    if not patterns:
+        return []
+
+    symbols = []
+    for line in source.splitlines():
+        if any(pattern.match(line) for pattern in patterns):
+            indent = "  " if line[:1].isspace() else ""
+            signature = line.strip().rstrip("{").rstrip()
+            symbols.append(f"{indent}{signature}"[:MAX_SIGNATURE_LENGTH])
+    return symbols
+
+
+def outline_file(path: str, source: str) -> list[str]:
+    if path.endswith(".py"):
+        return outline_python(source)
+    return outline_tagged(path, source)
+
+
+def build_outline(files: dict[str, str | None]) -> dict[str, list[str]]:
+    return {
+        path: outline_file(path, source)
+        for path, source in sorted(files.items())
+        if source is not None
+    }
+
+
+def identifier_tokens(text: str) -> set[str]:
+    return {
+        token.lower()
+        for token in re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+", text)
+        if len(token) >= 3
+    }
+
+
+def format_outline(
+    outline: dict[str, list[str]],
+    ranked: list[str] | None = None,
+    max_chars: int = MAX_OUTLINE_CHARS,
+) -> str:
+    ranked = [path for path in ranked or [] if path in outline]
+    ranked_set = set(ranked)
+    ordered = ranked + [p for p, symbols in outline.items() if symbols and p not in ranked_set]
+
+    other_files: dict[str, list[str]] = {}
+    for path, symbols in outline.items():
+        if not symbols and path not in ranked_set:
+            directory, _, name = path.rpartition("/")
+            other_files.setdefault(directory, []).append(name)
+
+    blocks = [[path] + [f"  {symbol}" for symbol in outline[path]] for path in ordered]
+    for directory, names in other_files.items():
+        listed = ", ".join(names[:MAX_LISTED_FILES])
+        more = f" (+{len(names) - MAX_LISTED_FILES} more)" if len(names) > MAX_LISTED_FILES else ""
+        blocks.append([f"{directory or '.'}/: {listed}{more}"])
+
+    lines: list[str] = []
+    size = 0
+    for block in blocks:
+        block_size = sum(len(line) + 1 for line in block)
+        if size + block_size > max_chars:
+            lines.append(f"... outline truncated ({len(outline)} files total)")
+            break
+        lines.extend(block)
+        size += block_size
+    return "\n".join(lines)
+
+
+class OutlineCache:
+    def __init__(self, cache_dir: str):
+        self.root = Path(cache_dir) / "outlines"
+
+    def _path(self, repo: str, sha: str) -> Path:
+        return self.root / repo.replace("/", "__") / f"{sha}.json"
+
+    def load(self, repo: str, sha: str) -> dict[str, list[str]] | None:
+        path = self._path(repo, sha)
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def save(self, repo: str, sha: str, outline: dict[str, list[str]]) -> None:
+        path = self._path(repo, sha)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(outline))
+        except OSError:
+            pass
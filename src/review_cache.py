@@ -0,0 +1,48 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(,\d+)? \+\d+(,\d+)? @@", re.MULTILINE)
+
+
+def file_digest(filename: str, status: str, patch: str | None, sha: str | None = None) -> str:
+    content = HUNK_HEADER.sub("@@", patch) if patch else sha or ""
+    return hashlib.sha256(f"{filename}\0{status}\0{content}".encode()).hexdigest()
+
+
+def review_key(
+    model: str, file_digests: list[str], issue_content: str, check_runs: list[dict]
+) -> str:
+    conclusions = sorted(
+        f"{run['name']}={run.get('conclusion') or run.get('status', 'unknown')}"
+        for run in check_runs
+    )
+    digest = hashlib.sha256()
+    for part in (model, "\n".join(sorted(file_digests)), issue_content, "\n".join(conclusions)):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ReviewCache:
+    def __init__(self, cache_dir: str):
+        self.root = Path(cache_dir) / "reviews"
+
+    def _path(self, repo: str, pr_number: int, key: str) -> Path:
+        return self.root / repo.replace("/", "__") / str(pr_number) / f"{key}.json"
+
+    def load(self, repo: str, pr_number: int, key: str) -> dict | None:
+        path = self._path(repo, pr_number, key)
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def save(self, repo: str, pr_number: int, key: str, review: dict) -> None:
+        path = self._path(repo, pr_number, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(review))
+        except OSError:
+            pass
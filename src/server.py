@@ -1,27 +1,47 @@
+import asyncio
 import hashlib
 import hmac
+import importlib
 import logging
+import os
 import re
-import time
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
 from fastapi import BackgroundTasks, FastAPI, Header, HTTPException, Request
 
-from src.agents.code_agent import CodeAgent
-from src.agents.reviewer_agent import ReviewerAgent
 from src.config import get_settings
-from src.github_client import GitHubClient
+from src.worker import run_job, serve
+
+if TYPE_CHECKING:
+    from src.github_client import GitHubClient
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 ITERATION_MARKER = "[SDLC-ITERATION:"
 
+WARM_MODULES = ("src.agents.code_agent", "src.agents.reviewer_agent")
+
+
+def warm_imports() -> None:
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    settings = get_settings()
+    warmup = asyncio.create_task(asyncio.to_thread(warm_imports))
+    worker = await serve(settings.worker_socket) if settings.worker_socket else None
     logger.info("SDLC Agent server started")
     yield
+    if worker:
+        worker.close()
+        await worker.wait_closed()
+        if os.path.exists(settings.worker_socket):
+            os.unlink(settings.worker_socket)
+    await warmup
     logger.info("SDLC Agent server stopped")
 
 
@@ -38,8 +58,8 @@ def verify_signature(payload: bytes, signature: str, secret: str) -> bool:
     return hmac.compare_digest(expected, signature)
 
 
-def get_iteration_count(github: GitHubClient, pr_number: int) -> int:
-    comments = github.get_pr_comments(pr_number)
+async def get_iteration_count(github: "GitHubClient", pr_number: int) -> int:
+    comments = await github.get_pr_comments(pr_number)
     for comment in reversed(comments):
         body = comment.get("body", "")
         if ITERATION_MARKER in body:
@@ -58,50 +78,54 @@ def extract_issue_number(body: str) -> int | None:
     return None
 
 
-def process_issue(issue_number: int, repo: str):
+async def process_issue(issue_number: int, repo: str):
     logger.info(f"Processing issue #{issue_number} in {repo}")
     try:
-        settings = get_settings()
-        settings.target_repo = repo
-        agent = CodeAgent(settings)
-        result = agent.run(issue_number)
+        result = await run_job("solve", issue_number, repo)
         logger.info(f"Issue #{issue_number} result: {result}")
     except Exception as e:
         logger.error(f"Error processing issue #{issue_number}: {e}")
 
 
-def process_pr_review(pr_number: int, repo: str):
+async def process_pr_review(pr_number: int, repo: str):
     logger.info(f"Reviewing PR #{pr_number} in {repo}")
     try:
+        from src.github_client import GitHubClient
+
         settings = get_settings()
         settings.target_repo = repo
 
-        github = GitHubClient(settings)
-        pr = github.get_pull_request(pr_number)
+        async with GitHubClient(settings) as github:
+            pr, iteration = await asyncio.gather(
+                github.get_pull_request(pr_number),
+                get_iteration_count(github, pr_number),
+            )
+            iteration += 1
+            logger.info(f"PR #{pr_number} iteration: {iteration}/{settings.max_iterations}")
 
-        iteration = get_iteration_count(github, pr_number) + 1
-        logger.info(f"PR #{pr_number} iteration: {iteration}/{settings.max_iterations}")
+            if iteration > settings.max_iterations:
+                logger.warning(f"PR #{pr_number} reached max iterations ({settings.max_iterations}), stopping")
+                await github.add_pr_comment(
+                    pr_number,
+                    f"⚠️ **Max iterations reached ({settings.max_iterations})**. Stopping automatic fixes."
+                )
+                return
 
-        if iteration > settings.max_iterations:
-            logger.warning(f"PR #{pr_number} reached max iterations ({settings.max_iterations}), stopping")
-            github.add_pr_comment(
-                pr_number,
-                f"⚠️ **Max iterations reached ({settings.max_iterations})**. Stopping automatic fixes."
-            )
-            return
+            result = await run_job("review", pr_number, repo)
+            logger.info(f"PR #{pr_number} review result: {result}")
 
-        agent = ReviewerAgent(settings)
-        result = agent.run(pr_number)
-        logger.info(f"PR #{pr_number} review result: {result}")
+            if result.get("cached"):
+                logger.info(f"PR #{pr_number} unchanged since last review, skipping fix cycle")
+                return
 
-        github.add_pr_comment(pr_number, f"<!-- {ITERATION_MARKER}{iteration}] -->")
+            await github.add_pr_comment(pr_number, f"<!-- {ITERATION_MARKER}{iteration}] -->")
 
         if result.get("success") and not result.get("approved", False):
-            issue_number = extract_issue_number(pr.body or "")
+            issue_number = extract_issue_number(pr["body"] or "")
             if issue_number and result.get("issues_count", 0) > 0:
                 logger.info(f"PR #{pr_number} not approved, triggering fix cycle for issue #{issue_number}")
-                time.sleep(2)
-                process_issue(issue_number, repo)
+                await asyncio.sleep(2)
+                await process_issue(issue_number, repo)
             else:
                 logger.info(f"PR #{pr_number} not approved but no linked issue found or no issues to fix")
         elif result.get("approved"):
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+
+from src.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+COMMANDS = ("solve", "review")
+LLM_TIMEOUT_MARGIN = 900
+
+
+async def run_job(
+    command: str, number: int, repo: str | None = None, candidates: int | None = None
+) -> dict:
+    settings = get_settings()
+    if repo:
+        settings.target_repo = repo
+    if candidates:
+        settings.candidate_count = candidates
+
+    if command == "solve":
+        from src.agents.code_agent import CodeAgent
+
+        return await CodeAgent(settings).run(number)
+
+    from src.agents.reviewer_agent import ReviewerAgent
+
+    return await ReviewerAgent(settings).run(number)
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        job = json.loads(await reader.readline())
+        if job.get("command") not in COMMANDS:
+            result = {"success": False, "error": f"Unknown command: {job.get('command')}"}
+        else:
+            logger.info(f"Worker running {job['command']} #{job['number']}")
+            result = await run_job(
+                job["command"], int(job["number"]), job.get("repo"), job.get("candidates")
+            )
+    except Exception as e:
+        logger.error(f"Worker job failed: {e}")
+        result = {"success": False, "error": str(e)}
+
+    writer.write(json.dumps(result).encode() + b"\n")
+    await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def serve(path: str) -> asyncio.AbstractServer:
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(_handle_connection, path=path)
+    os.chmod(path, 0o600)
+    logger.info(f"Warm worker listening on {path}")
+    return server
+
+
+def job_timeout(settings: Settings, candidates: int | None = None) -> int:
+    count = candidates or settings.candidate_count
+    return count * settings.candidate_test_timeout + LLM_TIMEOUT_MARGIN
+
+
+def submit(
+    path: str,
+    command: str,
+    number: int,
+    repo: str | None = None,
+    candidates: int | None = None,
+    timeout: float | None = None,
+) -> dict | None:
+    if not os.path.exists(path):
+        return None
+
+    job = {"command": command, "number": number, "repo": repo, "candidates": candidates}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            return None
+
+        sock.settimeout(timeout)
+        try:
+            sock.sendall(json.dumps(job).encode() + b"\n")
+            with sock.makefile("rb") as response:
+                line = response.readline()
+        except TimeoutError:
+            return {"success": False, "error": f"Worker did not respond within {timeout}s"}
+        except OSError as e:
+            return {"success": False, "error": f"Worker connection failed: {e}"}
+
+    if not line:
+        return {"success": False, "error": "Worker closed the connection without a result"}
+    return json.loads(line)
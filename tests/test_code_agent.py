@@ -0,0 +1,137 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.agents.code_agent import CodeAgent, run_git
+from src.config import Settings
+
+
+@pytest.fixture
+def agent(tmp_path: Path) -> CodeAgent:
+    return CodeAgent(Settings(cache_dir=str(tmp_path / "cache")))
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.py").write_text("x = 1\n")
+    return repo
+
+
+def test_check_candidate_counts_compile_errors(agent: CodeAgent, root: Path) -> None:
+    changes = {
+        "changes": [
+            {"path": "app.py", "action": "modify", "content": "def broken(:\n"},
+            {"path": "data.json", "action": "create", "content": "{not json"},
+            {"path": "new.py", "action": "create", "content": "y = 2\n"},
+        ]
+    }
+    assert agent._check_candidate(root, changes) == 2
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"path": "../outside.py", "action": "create", "content": ""},
+        {"path": "missing.py", "action": "modify", "content": ""},
+        {"path": "missing.py", "action": "delete"},
+        {"path": "app.py", "action": "rename", "content": ""},
+        {"path": "app.py", "action": "modify"},
+    ],
+)
+def test_check_candidate_rejects_changes_that_do_not_apply(
+    agent: CodeAgent, root: Path, change: dict
+) -> None:
+    assert agent._check_candidate(root, {"changes": [change]}) is None
+
+
+def test_collect_candidates_reports_first_error_when_all_fail(agent: CodeAgent) -> None:
+    candidates, error = agent._collect_candidates([ValueError("bad key"), RuntimeError("down")])
+    assert candidates == []
+    assert error == "LLM request failed: bad key"
+
+
+def test_collect_candidates_ignores_errors_when_one_succeeds(agent: CodeAgent) -> None:
+    ok = '{"changes": [{"path": "a.py", "action": "create", "content": ""}]}'
+    candidates, error = agent._collect_candidates([ValueError("timeout"), ok, "no json"])
+    assert len(candidates) == 1
+    assert error is None
+
+
+def test_rank_files_ignores_stop_words_and_matches_whole_tokens(agent: CodeAgent) -> None:
+    outline = {
+        "src/handler.py": ["def format_data()"],
+        "src/diff.py": ["def get_pr_diff(pr_number)"],
+    }
+    ranked = agent._rank_files("Fix the PR diff", "and make it faster for large PRs", outline)
+    assert ranked[0] == "src/diff.py"
+
+
+def test_rank_files_falls_back_to_source_files(agent: CodeAgent) -> None:
+    outline = {
+        "README.md": [],
+        "src/small.py": ["def a()"],
+        "src/big.py": ["def a()", "def b()"],
+    }
+    assert agent._rank_files("Something", "unrelated", outline) == ["src/big.py", "src/small.py"]
+
+
+def test_score_candidate_runs_tests_and_restores_worktree(tmp_path: Path) -> None:
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "app.py").write_text("VALUE = 1\n")
+    for args in (["init", "-q"], ["add", "-A"], ["commit", "-q", "-m", "init"]):
+        asyncio.run(run_git(str(root), *args))
+
+    agent = CodeAgent(
+        Settings(
+            cache_dir=str(tmp_path / "cache"),
+            candidate_test_command='python -c "import app; assert app.VALUE == 2"',
+        )
+    )
+    passing = {"changes": [{"path": "app.py", "action": "modify", "content": "VALUE = 2\n"}]}
+    failing = {"changes": [{"path": "app.py", "action": "modify", "content": "VALUE = 3\n"}]}
+
+    assert asyncio.run(agent._score_candidate(root, passing)) == (0, 1)
+    assert asyncio.run(agent._score_candidate(root, failing)) == (0, 0)
+    assert (root / "app.py").read_text() == "VALUE = 1\n"
+    assert asyncio.run(agent._select_candidate(root, [failing, passing])) is passing
+
+
+class FakeGitHub:
+    def __init__(self, sources: dict[str, str | None] | Exception):
+        self.sources = sources
+
+    async def get_commit_sha(self, ref: str) -> str:
+        return "abc123"
+
+    async def get_source_files(self, sha: str) -> dict[str, str | None]:
+        if isinstance(self.sources, Exception):
+            raise self.sources
+        return self.sources
+
+    async def get_repo_files(self, ref: str = "main") -> list[str]:
+        return ["README.md", "src/app.py"]
+
+
+def test_load_outline_builds_and_caches_by_commit(agent: CodeAgent) -> None:
+    github = FakeGitHub({"src/app.py": "def main():\n    pass\n"})
+    outline, sources = asyncio.run(agent._load_outline(github, "main"))
+    assert outline == {"src/app.py": ["def main()"]}
+    assert sources == github.sources
+
+    cached, _ = asyncio.run(agent._load_outline(FakeGitHub(RuntimeError("unused")), "main"))
+    assert cached == outline
+
+
+def test_load_outline_logs_download_failure_and_falls_back(
+    agent: CodeAgent, caplog: pytest.LogCaptureFixture
+) -> None:
+    github = FakeGitHub(httpx.ConnectError("network down"))
+    outline, sources = asyncio.run(agent._load_outline(github, "main"))
+    assert outline == {"README.md": [], "src/app.py": []}
+    assert sources == {}
+    assert "network down" in caplog.text
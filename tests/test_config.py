@@ -0,0 +1,26 @@
+import pytest
+
+from src.config import get_settings
+
+
+def test_diff_exclude_globs_from_env_example_format(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DIFF_EXCLUDE_GLOBS", "*.lock,package-lock.json,vendor/*,dist/*")
+    settings = get_settings()
+    assert settings.diff_exclude_patterns() == [
+        "*.lock",
+        "package-lock.json",
+        "vendor/*",
+        "dist/*",
+    ]
+
+
+def test_diff_exclude_globs_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("DIFF_EXCLUDE_GLOBS", raising=False)
+    patterns = get_settings().diff_exclude_patterns()
+    assert "*.lock" in patterns
+    assert "*/node_modules/*" in patterns
+
+
+def test_diff_exclude_globs_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DIFF_EXCLUDE_GLOBS", "")
+    assert get_settings().diff_exclude_patterns() == []
@@ -0,0 +1,169 @@
+import asyncio
+import base64
+
+import httpx
+
+from src.config import Settings
+from src.github_client import DiffBuilder, GitHubClient, make_file_record
+
+
+def record(filename: str, patch: str | None, **kwargs) -> dict:
+    return make_file_record(filename, "modified", 1, 1, patch, **kwargs)
+
+
+def test_make_file_record_excludes_by_path_and_basename() -> None:
+    globs = ["*.lock", "vendor/*", "*/vendor/*"]
+    assert record("poetry.lock", "+x", exclude_globs=globs)["skipped"] == "excluded"
+    assert record("app/vendor/lib.js", "+x", exclude_globs=globs)["skipped"] == "excluded"
+    assert record("src/app.py", "+x", exclude_globs=globs)["skipped"] is None
+
+
+def test_make_file_record_marks_binary_files() -> None:
+    assert record("logo.png", None)["skipped"] == "binary or no textual diff"
+
+
+def test_make_file_record_truncates_large_patches() -> None:
+    result = record("big.py", "x" * 120, max_file_chars=100)
+    assert result["skipped"] is None
+    assert result["patch"] == "x" * 100 + "\n[truncated 20 chars]"
+
+
+def test_diff_builder_renders_files_and_skipped() -> None:
+    builder = DiffBuilder()
+    assert builder.add(record("a.py", "+a"))
+    assert builder.add(record("logo.png", None))
+    assert builder.render() == (
+        "File: a.py\nStatus: modified\n+a\n\n"
+        "Skipped files:\n- logo.png: binary or no textual diff\n"
+    )
+
+
+def test_diff_builder_stops_at_budget_and_reports_unfetched_files() -> None:
+    part = "File: a.py\nStatus: modified\n+a\n\n"
+    builder = DiffBuilder(max_chars=len(part) + 10)
+    assert builder.add(record("a.py", "+a"))
+    assert not builder.add(record("b.py", "+bbbbbbbbbbbbbbbbbbbb"))
+    assert builder.size == builder.max_chars
+    rendered = builder.render(total_files=5)
+    assert rendered.startswith(part + "File: b.p")
+    assert "[truncated " in rendered
+    assert "- b.py: truncated by diff budget\n" in rendered
+    assert rendered.endswith("- diff budget exhausted; 3 more file(s) not included\n")
+
+
+def test_diff_builder_reports_truncated_last_file() -> None:
+    builder = DiffBuilder(max_chars=20)
+    assert not builder.add(record("b.py", "+" + "b" * 100))
+    rendered = builder.render(total_files=1)
+    assert "\n[truncated " in rendered
+    assert rendered.endswith("Skipped files:\n- b.py: truncated by diff budget\n")
+
+
+def test_diff_builder_skipped_files_do_not_use_budget() -> None:
+    builder = DiffBuilder(max_chars=5)
+    assert builder.add(record("yarn.lock", "+x", exclude_globs=["*.lock"]))
+    assert builder.size == 0
+
+
+def mock_github(handler) -> GitHubClient:
+    return GitHubClient(Settings(target_repo="o/r"), transport=httpx.MockTransport(handler))
+
+
+def files_page(page: int, count: int, size: int) -> list[dict]:
+    return [
+        {
+            "filename": f"f{page}_{i}.py",
+            "status": "modified",
+            "additions": 1,
+            "deletions": 0,
+            "patch": "+" + "x" * size,
+        }
+        for i in range(count)
+    ]
+
+
+def files_handler(requested: list[int], last_page: int | None = None):
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", "1"))
+        requested.append(page)
+        headers = {}
+        if page != last_page:
+            next_url = f"https://api.github.com/repos/o/r/pulls/1/files?per_page=2&page={page + 1}"
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        return httpx.Response(200, json=files_page(page, 2, 50), headers=headers)
+
+    return handler
+
+
+def build_diff(handler, max_chars: int, complete: bool = False) -> DiffBuilder:
+    async def fetch() -> DiffBuilder:
+        github = mock_github(handler)
+        builder = await github.build_pr_diff(1, max_chars=max_chars, complete=complete)
+        await github.client.aclose()
+        return builder
+
+    return asyncio.run(fetch())
+
+
+def test_get_pr_diff_follows_pages_and_stops_at_budget() -> None:
+    requested: list[int] = []
+
+    async def fetch(max_chars: int) -> str:
+        github = mock_github(files_handler(requested))
+        diff = await github.get_pr_diff(1, max_chars=max_chars, total_files=10)
+        await github.client.aclose()
+        return diff
+
+    diff = asyncio.run(fetch(200))
+    assert requested == [1, 2]
+    assert "File: f1_1.py" in diff
+    assert "- f2_0.py: truncated by diff budget" in diff
+    assert diff.endswith("- diff budget exhausted; 7 more file(s) not included\n")
+
+    requested.clear()
+    diff = asyncio.run(fetch(100))
+    assert requested == [1]
+    assert "- f1_1.py: truncated by diff budget" in diff
+
+
+def test_build_pr_diff_complete_digests_every_file() -> None:
+    requested: list[int] = []
+    builder = build_diff(files_handler(requested, last_page=3), max_chars=100, complete=True)
+    assert requested == [1, 2, 3]
+    assert len(builder.digests) == 6
+    assert builder.render().endswith("- diff budget exhausted; 4 more file(s) not included\n")
+
+
+def test_get_check_runs_paginates_by_total_count() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        runs = [
+            {"name": f"c{page}_{i}", "status": "completed", "conclusion": "success", "output": {}}
+            for i in range(100 if page == 1 else 20)
+        ]
+        return httpx.Response(200, json={"total_count": 120, "check_runs": runs})
+
+    async def fetch() -> list[dict]:
+        github = mock_github(handler)
+        runs = await github.get_check_runs(1, head_sha="abc")
+        await github.client.aclose()
+        return runs
+
+    assert len(asyncio.run(fetch())) == 120
+
+
+def test_get_file_content_quotes_path() -> None:
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.raw_path.decode())
+        return httpx.Response(200, json={"content": base64.b64encode(b"hi").decode()})
+
+    async def fetch() -> str | None:
+        github = mock_github(handler)
+        content = await github.get_file_content("docs/a b#1.md", "main")
+        await github.client.aclose()
+        return content
+
+    assert asyncio.run(fetch()) == "hi"
+    assert paths[0].startswith("/repos/o/r/contents/docs/a%20b%231.md?")
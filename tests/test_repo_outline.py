@@ -0,0 +1,93 @@
+from src.repo_outline import (
+    build_outline,
+    format_outline,
+    identifier_tokens,
+    outline_python,
+    outline_tagged,
+)
+
+
+def test_outline_python_lists_classes_methods_and_signatures() -> None:
+    source = '''
+class Agent(Base):
+    def run(self, issue_number: int) -> dict:
+        return {}
+
+    async def run_async(self, n):
+        pass
+
+def helper(a, b=1):
+    pass
+'''
+    assert outline_python(source) == [
+        "class Agent(Base)",
+        "  def run(self, issue_number: int) -> dict",
+        "  async def run_async(self, n)",
+        "def helper(a, b=1)",
+    ]
+
+
+def test_outline_python_returns_nothing_for_invalid_source() -> None:
+    assert outline_python("def broken(:") == []
+
+
+def test_outline_tagged_handles_typescript_and_skips_control_flow() -> None:
+    source = """export class Foo {
+  async bar(x: number): Promise<void> {
+    if (x) {
+    }
+  }
+}
+export const baz = (a) => a
+function qux(a, b) {
+}"""
+    assert outline_tagged("a.ts", source) == [
+        "export class Foo",
+        "  async bar(x: number): Promise<void>",
+        "export const baz = (a) => a",
+        "function qux(a, b)",
+    ]
+
+
+def test_outline_tagged_handles_go() -> None:
+    source = "type Server struct {\n}\nfunc (s *Server) Run(ctx context.Context) error {\n}"
+    assert outline_tagged("main.go", source) == [
+        "type Server struct",
+        "func (s *Server) Run(ctx context.Context) error",
+    ]
+
+
+def test_build_outline_drops_binary_files() -> None:
+    assert build_outline({"logo.png": None, "a.py": "x = 1"}) == {"a.py": []}
+
+
+def test_format_outline_puts_ranked_first_and_collapses_symbolless_files() -> None:
+    outline = {
+        ".github/workflows/ci.yml": [],
+        "docs/a.md": [],
+        "docs/b.md": [],
+        "src/a.py": ["def a()"],
+        "src/b.py": ["def b()"],
+    }
+    assert format_outline(outline, ["src/b.py"]).splitlines() == [
+        "src/b.py",
+        "  def b()",
+        "src/a.py",
+        "  def a()",
+        ".github/workflows/: ci.yml",
+        "docs/: a.md, b.md",
+    ]
+
+
+def test_format_outline_truncates_low_priority_entries_first() -> None:
+    outline = {"docs/a.md": [], "src/core.py": ["def core()"]}
+    text = format_outline(outline, max_chars=25)
+    assert text.splitlines() == [
+        "src/core.py",
+        "  def core()",
+        "... outline truncated (2 files total)",
+    ]
+
+
+def test_identifier_tokens_split_camel_and_snake_case() -> None:
+    assert identifier_tokens("src/getPRDiff get_pr_diff.py") == {"src", "get", "diff"}
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from src.github_client import DiffBuilder, make_file_record
+from src.review_cache import ReviewCache, review_key
+
+PATCH = "@@ -1,3 +1,4 @@ def run():\n+    return 1\n"
+REBASED = "@@ -40,3 +52,4 @@ def run():\n+    return 1\n"
+CHECKS = [{"name": "tests", "conclusion": "success"}, {"name": "lint", "conclusion": "success"}]
+
+
+def build(patches: dict[str, str | None], max_chars: int | None = None, **kwargs) -> DiffBuilder:
+    builder = DiffBuilder(max_chars)
+    for filename, patch in patches.items():
+        builder.add(make_file_record(filename, "modified", 1, 0, patch, **kwargs))
+    return builder
+
+
+def key(patches: dict[str, str | None], **kwargs) -> str:
+    return review_key("m", build(patches, max_chars=200, **kwargs).digests, "issue", CHECKS)
+
+
+def test_review_key_ignores_hunk_line_numbers() -> None:
+    assert key({"app.py": PATCH}) == key({"app.py": REBASED})
+
+
+def test_review_key_ignores_check_run_order() -> None:
+    digests = build({"app.py": PATCH}).digests
+    reordered = review_key("m", digests, "issue", CHECKS[::-1])
+    assert review_key("m", digests, "issue", CHECKS) == reordered
+
+
+def test_review_key_changes_with_content_issue_ci_and_model() -> None:
+    digests = build({"app.py": PATCH}).digests
+    base = review_key("m", digests, "issue", CHECKS)
+    assert base != key({"app.py": PATCH.replace("return 1", "return 2")})
+    assert base != review_key("m", digests, "edited issue", CHECKS)
+    assert base != review_key("m", digests, "issue", [{"name": "tests", "conclusion": "failure"}])
+    assert base != review_key("other", digests, "issue", CHECKS)
+
+
+def test_review_key_covers_changes_beyond_diff_budget() -> None:
+    big = "+" + "x" * 300 + "\n"
+    first = {"a.py": big, "b.py": PATCH}
+    second = {"a.py": big, "b.py": PATCH.replace("return 1", "return 2")}
+    assert build(first, max_chars=200).render() == build(second, max_chars=200).render()
+    assert key(first) != key(second)
+    longer = {"a.py": big + "+tail\n"}
+    assert key(longer, max_file_chars=100) != key({"a.py": big}, max_file_chars=100)
+
+
+def test_review_key_uses_blob_sha_for_binary_files() -> None:
+    assert key({"logo.png": None}, sha="abc") != key({"logo.png": None}, sha="def")
+
+
+def test_review_cache_round_trip(tmp_path: Path) -> None:
+    cache = ReviewCache(str(tmp_path))
+    review = {"approved": False, "summary": "Needs work", "issues": []}
+
+    assert cache.load("owner/repo", 3, "abc") is None
+    cache.save("owner/repo", 3, "abc", review)
+    assert cache.load("owner/repo", 3, "abc") == review
+    assert cache.load("owner/repo", 4, "abc") is None
@@ -0,0 +1,72 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src import worker
+from src.config import Settings
+
+
+async def round_trip(path: str, command: str) -> dict | None:
+    server = await worker.serve(path)
+    try:
+        return await asyncio.to_thread(worker.submit, path, command, 7, "owner/repo", 3)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_submit_hands_job_to_running_worker(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+
+    async def fake_run_job(command: str, number: int, repo: str | None, candidates: int | None):
+        calls.append((command, number, repo, candidates))
+        return {"success": True, "pr_url": "https://example.test/pr/1"}
+
+    monkeypatch.setattr(worker, "run_job", fake_run_job)
+    result = asyncio.run(round_trip(str(tmp_path / "worker.sock"), "solve"))
+
+    assert result == {"success": True, "pr_url": "https://example.test/pr/1"}
+    assert calls == [("solve", 7, "owner/repo", 3)]
+
+
+def test_worker_rejects_unknown_command(tmp_path: Path) -> None:
+    result = asyncio.run(round_trip(str(tmp_path / "worker.sock"), "deploy"))
+    assert result == {"success": False, "error": "Unknown command: deploy"}
+
+
+def test_submit_returns_none_without_worker(tmp_path: Path) -> None:
+    assert worker.submit(str(tmp_path / "missing.sock"), "review", 1) is None
+
+
+def test_submit_returns_none_for_stale_socket_file(tmp_path: Path) -> None:
+    path = tmp_path / "stale.sock"
+    path.write_text("")
+    assert worker.submit(str(path), "review", 1) is None
+
+
+def test_submit_times_out_on_hung_worker(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def hung_run_job(*args: object) -> dict:
+        await asyncio.sleep(5)
+        return {"success": True}
+
+    async def submit_with_timeout(path: str) -> dict | None:
+        server = await worker.serve(path)
+        try:
+            return await asyncio.to_thread(worker.submit, path, "review", 1, timeout=0.2)
+        finally:
+            server.close()
+
+    monkeypatch.setattr(worker, "run_job", hung_run_job)
+    result = asyncio.run(submit_with_timeout(str(tmp_path / "worker.sock")))
+    assert result == {"success": False, "error": "Worker did not respond within 0.2s"}
+
+
+def test_job_timeout_scales_with_candidates() -> None:
+    settings = Settings(candidate_count=2, candidate_test_timeout=100)
+    assert worker.job_timeout(settings) == 200 + worker.LLM_TIMEOUT_MARGIN
+    assert worker.job_timeout(settings, 5) == 500 + worker.LLM_TIMEOUT_MARGIN